@@ -1,32 +1,20 @@
 import pandas as pd
-import numpy as np
-from datetime import datetime
-import matplotlib.pyplot as plt
+from common import HEADER_SCAN_ROWS, YEAR_ROW_PATTERN, find_row, match_columns, parse_years, read_excel_sheet, to_numeric_frame, trend_data
 
-def parse_year(year_str):
-    """Convert a year string to a readable format."""
-    try:
-        year = int(year_str[:4])
-        month = int(year_str[4:])
-        return datetime(year, month, 1).strftime('%b-%Y')
-    except:
-        return year_str
+KEY_ITEMS = ['Total Assets', 'Total Liabilities', 'Total Shareholders Funds']
+RATIO_ITEMS = ['Total Current Assets', 'Total Current Liabilities', 'Total Debt', 'Total Shareholders Funds']
 
 def load_balance_sheet_file(file):
     """Load and preprocess the Balance Sheet Excel file."""
     try:
-        df = pd.read_excel(file, engine='xlrd', header=None)
-        year_row_idx = df.index[df.iloc[:, 0].str.match('Year', na=False)].tolist()[0]
+        df = read_excel_sheet(file, header=None)
+        year_row_idx = find_row(df.iloc[:HEADER_SCAN_ROWS, 0], YEAR_ROW_PATTERN)
         header = df.iloc[year_row_idx]
         data_df = df.iloc[year_row_idx + 1:].reset_index(drop=True)
-        data_df.columns = header
-        data_df.rename(columns={'Year': 'Item'}, inplace=True)
-        year_cols = data_df.columns[1:]
-        data_df = data_df.dropna(subset=year_cols, how='all')
-        data_df.columns = ['Item'] + [parse_year(str(col)) for col in year_cols]
-        for col in data_df.columns[1:]:
-            data_df[col] = pd.to_numeric(data_df[col], errors='coerce')
-        data_df.fillna(0, inplace=True)
+        data_df = data_df[~pd.isna(data_df.iloc[:, 1:].to_numpy()).all(axis=1)]
+        data_df.columns = ['Item'] + parse_years(header.iloc[1:])
+        data_df = pd.concat([data_df.iloc[:, :1], to_numeric_frame(data_df.iloc[:, 1:])], axis=1)
+        data_df['Item'] = data_df['Item'].astype('category')
         return data_df
     except Exception as e:
         print(f"Error loading Balance Sheet file: {e}")
@@ -43,35 +31,15 @@ def analyze_balance_sheet(df):
     if df is None:
         return None
     analysis = {}
-    if 'Total Current Assets' in df.columns and 'Total Current Liabilities' in df.columns:
-        analysis['Current Ratio'] = df['Total Current Assets'] / df['Total Current Liabilities']
-    if 'Total Debt' in df.columns and 'Total Shareholders Funds' in df.columns:
-        analysis['Debt-to-Equity Ratio'] = df['Total Debt'] / df['Total Shareholders Funds']
-    key_items = ['Total Assets', 'Total Liabilities', 'Total Shareholders Funds']
-    for item in key_items:
-        if item in df.columns:
-            growth = df[item].pct_change() * 100
-            analysis[f'{item} YoY Growth (%)'] = growth
-    return pd.DataFrame(analysis)
-
-def visualize_trends(df):
-    """Visualize trends in Balance Sheet data."""
-    if df is None:
-        return None
-    key_items = ['Total Assets', 'Total Liabilities', 'Total Shareholders Funds']
-    fig, ax = plt.subplots(figsize=(12, 6))
-    for item in key_items:
-        if item in df.columns:
-            ax.plot(df.index, df[item], label=item, marker='o')
-    ax.set_title('Balance Sheet Trends Over Time')
-    ax.set_xlabel('Year')
-    ax.set_ylabel('Amount (Rs in)')
-    ax.legend()
-    ax.grid(True)
-    ax.set_xticks(df.index)
-    ax.set_xticklabels(df.index, rotation=45)
-    plt.tight_layout()
-    return fig
+    items = match_columns(df, RATIO_ITEMS + KEY_ITEMS)
+    if 'Total Current Assets' in items and 'Total Current Liabilities' in items:
+        analysis['Current Ratio'] = df[items['Total Current Assets']] / df[items['Total Current Liabilities']]
+    if 'Total Debt' in items and 'Total Shareholders Funds' in items:
+        analysis['Debt-to-Equity Ratio'] = df[items['Total Debt']] / df[items['Total Shareholders Funds']]
+    growth_items = [item for item in KEY_ITEMS if item in items]
+    growth = df[[items[item] for item in growth_items]].pct_change() * 100
+    growth.columns = [f'{item} YoY Growth (%)' for item in growth_items]
+    return pd.concat([pd.DataFrame(analysis, index=df.index), growth], axis=1)
 
 def process_balance_sheet_file(file):
     """Tie together all steps for Balance Sheet analysis."""
@@ -80,5 +48,5 @@ def process_balance_sheet_file(file):
         return None, None, None, None
     rearranged_df = rearrange_data(balance_sheet_df)
     analysis_df = analyze_balance_sheet(rearranged_df)
-    fig = visualize_trends(rearranged_df)
-    return balance_sheet_df, rearranged_df, analysis_df, fig
+    trends_df = trend_data(rearranged_df, KEY_ITEMS)
+    return balance_sheet_df, rearranged_df, analysis_df, trends_df
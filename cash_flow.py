@@ -1,73 +1,40 @@
+import re
 import pandas as pd
 import numpy as np
-from datetime import datetime
-import matplotlib.pyplot as plt
+from common import HEADER_SCAN_ROWS, YEAR_ROW_PATTERN, find_row, match_columns, parse_years, read_excel_sheet, rearrange_data, to_numeric_frame, trend_data
 
-def parse_year(year_str):
-    """Convert a year string (e.g., '201103') to a readable format (e.g., 'Mar-2011')."""
-    try:
-        year = int(year_str[:4])
-        month = int(year_str[4:])
-        return datetime(year, month, 1).strftime('%b-%Y')
-    except:
-        return year_str
+DATA_START_PATTERN = re.compile('Cash Flow Summary')
+KEY_METRICS = ['Net Cash from Operating Activities', 'Net Cash Used in Investing Activities', 'Net Cash Used in Financing Activities']
 
 def load_cash_flow_file(file):
     """Load and preprocess the Cash Flow Excel file."""
     try:
-        df = pd.read_excel(file, engine='xlrd', skiprows=5, header=None)
-        year_row_idx = df.index[df.iloc[:, 0].str.match('Year', na=False)].tolist()[0]
-        years = df.iloc[year_row_idx, 1:].dropna().tolist()
-        parsed_years = [parse_year(str(y)) for y in years]
-        data_start_idx = df.index[df.iloc[:, 0].str.contains('Cash Flow Summary', na=False)].tolist()[0] + 2
+        df = read_excel_sheet(file, skiprows=5, header=None)
+        year_row_idx = find_row(df.iloc[:HEADER_SCAN_ROWS, 0], YEAR_ROW_PATTERN)
+        year_row = df.iloc[year_row_idx, 1:].to_numpy()
+        years = year_row[pd.notna(year_row)]
+        parsed_years = parse_years(years)
+        data_start_idx = find_row(df.iloc[:, 0], DATA_START_PATTERN) + 2
         data_df = df.iloc[data_start_idx:].reset_index(drop=True)
         data_df.set_index(data_df.columns[0], inplace=True)
         data_df = data_df.iloc[:, 1:len(years) + 1]
         data_df.columns = parsed_years
-        data_df = data_df.apply(pd.to_numeric, errors='coerce').fillna(0)
+        data_df = to_numeric_frame(data_df)
         return data_df
     except Exception as e:
         print(f"Error loading Cash Flow file: {e}")
         return None
 
-def rearrange_data(df):
-    """Rearrange the data with years as rows and metrics as columns."""
-    if df is None:
-        return None
-    return df.T
-
 def analyze_cash_flow(df):
     """Analyze the Cash Flow data, calculating growth rates and ratios."""
     if df is None:
         return None
-    analysis = {}
-    key_metrics = ['Net Cash from Operating Activities', 'Net Cash Used in Investing Activities', 'Net Cash Used in Financing Activities']
-    for metric in key_metrics:
-        if metric in df.columns:
-            growth = df[metric].pct_change() * 100
-            analysis[f'{metric} YoY Growth (%)'] = growth
-    if 'Net Cash from Operating Activities' in df.columns and 'Net Cash Used in Investing Activities' in df.columns:
-        analysis['Op. CF to Inv. CF Ratio'] = df['Net Cash from Operating Activities'] / df['Net Cash Used in Investing Activities'].replace(0, np.nan)
-    return pd.DataFrame(analysis)
-
-def visualize_trends(df):
-    """Visualize trends in Cash Flow data."""
-    if df is None:
-        return None
-    key_metrics = ['Net Cash from Operating Activities', 'Net Cash Used in Investing Activities', 'Net Cash Used in Financing Activities']
-    fig, ax = plt.subplots(figsize=(12, 6))
-    for metric in key_metrics:
-        if metric in df.columns:
-            ax.plot(df.index, df[metric], label=metric, marker='o')
-    ax.set_title('Cash Flow Trends Over Time')
-    ax.set_xlabel('Year')
-    ax.set_ylabel('Amount (Rs in)')
-    ax.legend()
-    ax.grid(True)
-    ax.set_xticks(df.index)
-    ax.set_xticklabels(df.index, rotation=45)
-    plt.tight_layout()
-    return fig
+    metrics = match_columns(df, KEY_METRICS)
+    analysis = df[list(metrics.values())].pct_change() * 100
+    analysis.columns = [f'{metric} YoY Growth (%)' for metric in metrics]
+    if 'Net Cash from Operating Activities' in metrics and 'Net Cash Used in Investing Activities' in metrics:
+        analysis['Op. CF to Inv. CF Ratio'] = df[metrics['Net Cash from Operating Activities']] / df[metrics['Net Cash Used in Investing Activities']].replace(0, np.nan)
+    return analysis
 
 def process_cash_flow_file(file):
     """Tie together all steps for Cash Flow analysis."""
@@ -76,5 +43,5 @@ def process_cash_flow_file(file):
         return None, None, None, None
     rearranged_df = rearrange_data(cash_flow_df)
     analysis_df = analyze_cash_flow(rearranged_df)
-    fig = visualize_trends(rearranged_df)
-    return cash_flow_df, rearranged_df, analysis_df, fig
+    trends_df = trend_data(rearranged_df, KEY_METRICS)
+    return cash_flow_df, rearranged_df, analysis_df, trends_df
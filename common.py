@@ -0,0 +1,69 @@
+import io
+import re
+import pandas as pd
+import numpy as np
+
+try:
+    from python_calamine import CalamineError
+except ImportError:
+    CalamineError = ImportError
+
+EXCEL_ENGINES = ['calamine', 'xlrd']
+YEAR_ROW_PATTERN = re.compile('^Year')
+HEADER_SCAN_ROWS = 50
+
+def parse_years(values):
+    """Convert a sequence of year labels (e.g., 201103) to readable format in one pass."""
+    labels = pd.Series([str(value) for value in values], dtype=object)
+    dates = pd.to_datetime(labels.str.strip().str.replace(r'\.0$', '', regex=True), format='%Y%m', errors='coerce')
+    return dates.dt.strftime('%b-%Y').where(dates.notna(), labels).tolist()
+
+def find_row(column, pattern):
+    """Return the position of the first cell in a column matching a pattern."""
+    matches = column.str.contains(pattern, na=False).to_numpy()
+    if not matches.any():
+        raise ValueError(f"No row matching '{pattern.pattern}' found")
+    return int(matches.argmax())
+
+def to_numeric_frame(frame):
+    """Coerce every cell of a frame to float in a single pass, filling blanks and text with 0."""
+    values = frame.to_numpy(dtype=object)
+    block = np.asarray(pd.to_numeric(values.ravel(), errors='coerce'), dtype=np.float64)
+    block[np.isnan(block)] = 0
+    return pd.DataFrame(block.reshape(values.shape), index=frame.index, columns=frame.columns)
+
+def read_excel_sheet(file, **kwargs):
+    """Read the first worksheet from one in-memory copy of the file, trying each Excel engine in turn."""
+    raw = io.BytesIO(file.read())
+    for engine in EXCEL_ENGINES[:-1]:
+        raw.seek(0)
+        try:
+            return pd.read_excel(raw, engine=engine, **kwargs)
+        except (ImportError, CalamineError):
+            continue
+    raw.seek(0)
+    return pd.read_excel(raw, engine=EXCEL_ENGINES[-1], **kwargs)
+
+def match_columns(df, names):
+    """Map each wanted item name to its column, ignoring case and surrounding spaces."""
+    lookup = {}
+    for col in df.columns:
+        lookup.setdefault(str(col).strip().lower(), col)
+    return {name: lookup[name.lower()] for name in names if name.lower() in lookup}
+
+def rearrange_data(df):
+    """Rearrange the data with years as rows and metrics as columns (a view, since loaders build one float block)."""
+    if df is None:
+        return None
+    return df.T
+
+def trend_data(df, names):
+    """Select the named items to chart, indexed by period."""
+    if df is None:
+        return None
+    items = match_columns(df, names)
+    trends = df[list(items.values())].set_axis(list(items), axis=1)
+    periods = pd.to_datetime(trends.index, format='%b-%Y', errors='coerce')
+    if periods.notna().all():
+        trends = trends.set_axis(periods)
+    return trends.rename_axis(index=None, columns=None)
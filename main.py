@@ -1,3 +1,4 @@
+import io
 import streamlit as st
 from cash_flow import process_cash_flow_file
 from profit_loss import process_profit_loss_file
@@ -18,13 +19,17 @@ process_functions = {
     "Balance Sheet": process_balance_sheet_file
 }
 
-# File uploader with dynamic label
-uploaded_file = st.file_uploader(f"Upload {analysis_type} Excel File", type=["xls"])
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def run_analysis(analysis_type, file_id, _file_bytes):
+    """Run the selected analysis, reusing the result for the same upload."""
+    return process_functions[analysis_type](io.BytesIO(_file_bytes))
+
+# File uploader with dynamic label; the fixed key keeps the upload when the analysis type changes
+uploaded_file = st.file_uploader(f"Upload {analysis_type} Excel File", type=["xls"], key="statement_file")
 
 # Process the uploaded file and display results
 if uploaded_file is not None:
-    process_func = process_functions[analysis_type]
-    df1, df2, df3, fig = process_func(uploaded_file)
+    df1, df2, df3, trends = run_analysis(analysis_type, uploaded_file.file_id, uploaded_file.getvalue())
     if df1 is not None:
         st.subheader("Preprocessed Data")
         st.dataframe(df1)
@@ -33,6 +38,6 @@ if uploaded_file is not None:
         st.subheader("Financial Analysis")
         st.dataframe(df3)
         st.subheader("Trends")
-        st.pyplot(fig)
+        st.line_chart(trends)
     else:
         st.error("Error processing the file. Please check the file format.")